@@ -18,7 +18,31 @@
 #  51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA
 #######################################################################
 
-import sys, os, csv, re, collections, pdb
+import sys, os, csv, re, collections, pickle, pdb
+
+  # Pandas, if available, is used to bulk-parse the csv files a column
+  # at a time (see readcsv_pandas()); without it the csv files are read
+  # row by row in pure python.  Results are identical either way.
+try: import pandas
+except ImportError: pandas = None
+
+  # Numpy, if available, enables conjugate_numpy(), an alternative
+  # whole-array implementation of conjugate() (the generated per-pos
+  # functions conjugate() itself uses are faster still), and numba, if
+  # additionally available, provides a jit-compiled kernel for the
+  # string surgery in construct() (see construct_numba()).  Without
+  # them the pure python paths run instead.
+try: import numpy
+except ImportError: numpy = None
+try: import numba
+except ImportError: numba = None
+
+  # Name of the pickle file used to cache the parsed conjugation tables
+  # (see read_conj_tables()) and a version number that is stored in it
+  # and should be incremented whenever the structure of the conjugation
+  # table dict changes, invalidating any previously written cache files.
+CACHE_FILENAME = '.conj_cache.pkl'
+CACHE_VERSION = 7
 
 def main ():
         args = parse_args() # Parse command line, use --help for info.
@@ -32,7 +56,7 @@ def main ():
         except KeyError:
             sys.exit ("unknown part-of-speech: %s\n'conj.py --list' will "
                 "print a list of conjugatable parts-of-speech" % args.pos)
-        if pos not in [x[0] for x in ct['conjo']]:
+        if pos not in ct['_by_pos']:
             sys.exit ("no conjugation data available for part-of-speech: %s\n"
                 "'conj.py --list' will "
                 "print a list of conjugatable parts-of-speech" % args.pos)
@@ -81,39 +105,195 @@ def conjugate (ktxt, rtxt, pos, ct):
           form of 'ktxt' and 'rtxt' for that conjugation.
         '''
 
-        conjs = {}
-          # Get pos number from kw:
-        for conj,conjnm in sorted (ct['conj'].values(), key=lambda x:x[0]):
-            for neg, fml in (0,0),(0,1),(1,0),(1,1):
-                neg, fml = bool (neg), bool (fml)
-                for onum in range(1,10):  # onum values start at 1, not 0.
-                    try: _,_,_,_,_, stem, okuri, euphr, euphk, _ \
-                      = ct['conjo'][pos,conj,neg,fml,onum]
-                    except KeyError: break;
-                    kt = construct (ktxt, stem, okuri, euphr, euphk) \
-                         if ktxt else ''
-                    rt = construct (rtxt, stem, okuri, euphr, euphk) \
-                         if rtxt else ''
-                    txt = (kt + '【' + rt + '】') if kt and rt else (kt or rt)
-                    conjs[(pos,conj,neg,fml,onum)] = txt
-        return conjs
-
-def construct (txt, stem, okuri, euphr, euphk):
+        if pos not in ct['_templates']: return {}
+          # Whether each word is kana depends only on the word, so work
+          #  it out once here rather than per conjugated form.
+        k_iskana = iskana (ktxt) if ktxt else False
+        r_iskana = iskana (rtxt) if rtxt else False
+          # Dispatch to a function specialized to this pos (generated
+          # and compiled from its conjugation templates on first use,
+          # see gen_conj_func()) that produces every form in straight-
+          # line code with the okurigana embedded as constants.
+        funcs = ct.setdefault ('_conj_funcs', {})
+        f = funcs.get (pos)
+        if f is None: f = funcs[pos] = gen_conj_func (ct, pos)
+        return f (ktxt, rtxt, k_iskana, r_iskana)
+
+def gen_conj_func (ct, pos):
+        '''Generate, compile and return a function
+            f (ktxt, rtxt, k_iskana, r_iskana)
+        specialized to conjugate words of part-of-speech 'pos'.  The
+        conjugation table is fixed once loaded, so the sequence of
+        stem-slice-and-append operations for a pos can be unrolled into
+        straight-line code, one assignment per form, with the conjugation
+        keys, slice amounts and okurigana/euphonic strings baked in as
+        constants; no table lookups or loop machinery remain at call
+        time.  Functions are generated on first use per pos (see
+        conjugate()) and cached in ct['_conj_funcs'], which keeps the
+        generation off the startup path and out of the pickle cache
+        (functions cannot be pickled).
+        The produced dicts are identical to those of the template loop
+        this replaced, including key order.'''
+
+        lines_b = [];  lines_k = [];  lines_r = []
+        for key, stem, okuri, euphr, euphk in ct['_templates'][pos]:
+            kx = form_expr ('ktxt', 'k_isk', stem, okuri, euphr, euphk)
+            rx = form_expr ('rtxt', 'r_isk', stem, okuri, euphr, euphk)
+            kl = repr (key)
+            lines_b.append ("        out[%s] = %s + '【' + %s + '】'"
+                            % (kl, kx, rx))
+            lines_k.append ("        out[%s] = %s" % (kl, kx))
+            lines_r.append ("        out[%s] = %s" % (kl, rx))
+        src = ("def f (ktxt, rtxt, k_isk, r_isk):\n"
+               "    out = {}\n"
+               "    if ktxt and rtxt:\n%s\n"
+               "    elif ktxt:\n%s\n"
+               "    elif rtxt:\n%s\n"
+               "    else:\n"
+               "        return dict.fromkeys (KEYS, '')\n"
+               "    return out\n"
+               % ('\n'.join (lines_b), '\n'.join (lines_k),
+                  '\n'.join (lines_r)))
+        ns = {'KEYS': tuple (t[0] for t in ct['_templates'][pos])}
+        exec (compile (src, '<conj pos %s>' % pos, 'exec'), ns)
+        return ns['f']
+
+def form_expr (txtvar, iskvar, stem, okuri, euphr, euphk):
+        '''Return python source for the conjugated form of the word in
+        variable 'txtvar' under one conjugation template, for use by
+        gen_conj_func().  'iskvar' names the boolean variable holding
+        iskana(txt).  The kana and kanji variants each reduce to a
+        constant-amount slice plus a constant suffix (cf. construct());
+        when the variants coincide the conditional is omitted.'''
+
+        def one (euph):
+            n = stem + (1 if euph else 0)
+            suffix = (euph or '') + okuri
+              # txt[:-n] is the empty string when n is 0 (cf. the
+              #  stem==0 rows for e.g. adj-na), so constant-fold the
+              #  prefix away rather than emit an erroneous [:-0] slice.
+            if n == 0: return repr (suffix)
+            return '%s[:-%d] + %s' % (txtvar, n, repr (suffix))
+        kana_expr, kanji_expr = one (euphr), one (euphk)
+        if kana_expr == kanji_expr: return kana_expr
+        return '(%s if %s else %s)' % (kana_expr, iskvar, kanji_expr)
+
+def conjugate_numpy (ktxt, rtxt, pos, ct):
+        '''Alternative numpy implementation of conjugate(): computes all
+        the conjugated forms of a word with whole-array operations on
+        the per-pos template columns instead of one construct() call
+        per form.  Returns the same dict as conjugate(), whose generated
+        per-pos functions benchmark faster; this is kept for callers
+        that want the array form.'''
+
+        cols = ct.setdefault ('_np_cols', {}).get (pos)
+        if cols is None: cols = ct['_np_cols'][pos] = np_cols (ct, pos)
+        keys, stems, okuris, euphrs, euphks = cols
+        blank = numpy.full (len (keys), '', dtype=object)
+        kt = word_forms (ktxt, stems, okuris, euphrs, euphks) \
+             if ktxt else blank
+        rt = word_forms (rtxt, stems, okuris, euphrs, euphks) \
+             if rtxt else blank
+        txts = numpy.where ((kt != '') & (rt != ''),
+                            kt + '【' + rt + '】',
+                            numpy.where (kt != '', kt, rt))
+        return dict (zip (keys, txts.tolist()))
+
+def word_forms (txt, stems, okuris, euphrs, euphks):
+        '''Generate all conjugated forms of the single word 'txt' at once
+        from numpy template columns (built by np_cols()), returning an
+        object array of strings.  Whether 'txt' is kana is determined
+        once here -- it depends only on the word, not on the individual
+        conjugations.  Produces exactly what construct() would, form by
+        form.'''
+
+        euphs = euphrs if iskana (txt) else euphks
+          # One more stem character is dropped wherever a euphonic
+          #  replacement exists (cf. the stem adjustment in construct());
+          #  txt[:-s] must be '' when s is 0, as slicing with -0 gives.
+        adjs = stems + (euphs != '')
+        prefixes = numpy.array ([txt[:-s] if s else '' for s in adjs.tolist()],
+                                dtype=object)
+        return prefixes + euphs + okuris
+
+def np_cols (ct, pos):
+        '''Build the numpy column arrays for part-of-speech 'pos' from
+        its entry in ct['_templates']: the list of conjugation keys, an
+        int array of stem counts and object arrays of the okuri, euphr
+        and euphk strings (with None replaced by '').  Built on first
+        use per pos and cached in ct['_np_cols'].'''
+
+        tmpls = ct['_templates'][pos]
+        keys = [t[0] for t in tmpls]
+        stems = numpy.array ([t[1] for t in tmpls])
+        okuris = numpy.array ([t[2] for t in tmpls], dtype=object)
+        euphrs = numpy.array ([t[3] or '' for t in tmpls], dtype=object)
+        euphks = numpy.array ([t[4] or '' for t in tmpls], dtype=object)
+        return keys, stems, okuris, euphrs, euphks
+
+def iskana (txt):
+        '''Return true if the word 'txt' is kana, false if it is kanji,
+        determined by looking at its next-to-last character.  (Chained
+        integer comparisons against the code points of 'あ' (0x3042) and
+        'ん' (0x3093) are cheaper than one-character string comparisons.)
+        This is a property of the word alone, not of any particular
+        conjugation, so callers compute it once per word and pass the
+        result to construct() for each form.  Words of fewer than two
+        characters are not conjugatable and raise ValueError.'''
+
+        if len (txt) < 2:
+            raise ValueError ("Conjugatable words must be at least"
+                              " 2 characters long")
+        return 0x3042 < ord (txt[-2]) <= 0x3093
+
+def construct (txt, iskana, stem, okuri, euphr, euphk):
         '''Given a word (in kanji or kana), generate its conjugated form by
         by removing removing 'stem' characters from its end (and an additional
         character if the word is kana and 'euphr' is true or the word is in
         kanji and 'euphk' are true), then appending either 'euphr' or 'euphk'.
-        We determine if the word is kanji or kana by looking at its next-to-
-        last character.  Finally, 'okuri' is appended.'''
+        'iskana' is the result of iskana(txt), computed by the caller once
+        per word.  Finally, 'okuri' is appended.'''
 
-        if len (txt) < 2: 
-            raise ValueError ("Conjugatable words must be at least"
-                              " 2 characters long")
-        iskana = txt[-2] > 'あ' and txt[-2] <= 'ん'
-        if iskana and euphr or not iskana and euphk: stem += 1
-        if iskana: conjtxt = txt[:-stem] + (euphr or '') + okuri
-        else:      conjtxt = txt[:-stem] + (euphk or '') + okuri
-        return conjtxt
+        if numba is not None:
+            return construct_numba (txt, iskana, stem, okuri, euphr, euphk)
+          # Select the euphonic replacement once up front; one formula
+          #  then covers what was formerly separate kana/kanji branches.
+        euph = euphr if iskana else euphk
+        if euph: stem += 1
+        return txt[:-stem] + (euph or '') + okuri
+
+if numba is not None:
+    def construct_numba (txt, iskana, stem, okuri, euphr, euphk):
+        '''Same operation as the body of construct() but with the string
+        work done by the jit-compiled construct_kernel() below.  The
+        strings are converted to arrays of uint32 code points for the
+        kernel (utf-32-le is exactly one uint32 per character) and the
+        result array converted back to a str.'''
+
+        out = construct_kernel (
+            numpy.frombuffer (txt.encode ('utf-32-le'), numpy.uint32),
+            iskana, stem,
+            numpy.frombuffer ((okuri or '').encode ('utf-32-le'), numpy.uint32),
+            numpy.frombuffer ((euphr or '').encode ('utf-32-le'), numpy.uint32),
+            numpy.frombuffer ((euphk or '').encode ('utf-32-le'), numpy.uint32))
+        return out.tobytes().decode ('utf-32-le')
+
+    @numba.njit (cache=True)
+    def construct_kernel (txt, iskana, stem, okuri, euphr, euphk):
+        euph = euphr if iskana else euphk
+        if euph.shape[0]: stem += 1
+          # Mirror construct()'s txt[:-stem] which is '' when stem is 0
+          #  and also when stem exceeds the word length (python slicing
+          #  clamps; plain subtraction would go negative and missize
+          #  the output array).
+        keep = txt.shape[0] - stem if stem else 0
+        if keep < 0: keep = 0
+        out = numpy.empty (keep + euph.shape[0] + okuri.shape[0],
+                           numpy.uint32)
+        out[:keep] = txt[:keep]
+        out[keep:keep+euph.shape[0]] = euph
+        out[keep+euph.shape[0]:] = okuri
+        return out
 
 ###############################################################################
 # The remainder of this module is support functions for things like
@@ -145,12 +325,14 @@ def combine_onums (conjs, ct):
         We also append any relevant note numbers to the text string here.'''
 
         newconjs = {};  allnotes = set()
-        for key in sorted (conjs.keys()):
+          # conjugate() produces its dict in sorted key order (its
+          #  templates are pre-sorted), so iterating in insertion order
+          #  groups the onum variants correctly with no re-sort here.
+        for key, txt in conjs.items():
             pos,conj,neg,fml,onum = key
-            txt = conjs[key]
-            notes = ct['conjo_notes'][key]
+            notes = ct['conjo_notes'].get (key, ())
             allnotes.update (notes)
-            if notes: txt += '[' + ','.join([str(x) for x in notes]) + ']'
+            txt += ct['_note_tags'].get (key, '')
             if (pos,conj,neg,fml) not in newconjs:
                 newconjs[pos,conj,neg,fml] = txt
             else:
@@ -187,14 +369,16 @@ def read_conj_tables (dir):
         the .csv part.  Each value is the contents of the corresponding
         csv file in the form of another dict.  The keys of each of
         these dicts are the values of the first column of the csv
-        file (as converted by 'coltypes' below), except for 'conjo'
+        file (as converted by the file's parse_*() function), except
+        for 'conjo'
         where the key is a tuple of the first five columns.  An
         additional set of keys is added in the case of 'kwpos' which
         from the second (kw) column to allow looking up pos records
         by either id number or keyword string.
         The values of each of these dict's entries are a list of all
         the values in the csv file row (with each converted to the
-        right datatype as specified by 'coltypes'.)
+        right datatype by the file's parse_*() function, see 'parsers'
+        below.)
 
         Or, shown schematically:
 
@@ -219,83 +403,235 @@ def read_conj_tables (dir):
                      ...
                      }
         '''
-          # For each csv file (identified sans the .csv suffix), give a
-          # list of functions, one for each column in the file, that will
-          # convert the text string read into the correct data type.
-          # Note that xint() is the same as int() but handles empty
-          # ('') strings, sbool() converts text strings "t..." or "f..."
-          # to bools.
-        coltypes = {
-            'conj': [int, str],
-            'conjo': [int, int, sbool, sbool, int, int, str, str, str, xint],
-            'conotes': [int, str],
-            'conjo_notes': [int, int, sbool, sbool, int, int],
-            'kwpos': [int, str, str],}
+          # For each csv file (identified sans the .csv suffix), give the
+          # function (defined following readcsv() below) that converts one
+          # row of text strings read from that file into a list of values
+          # of the correct data types (int, bool, etc).
+        parsers = {
+            'conj': parse_conj,
+            'conjo': parse_conjo,
+            'conotes': parse_conotes,
+            'conjo_notes': parse_conjo_notes,
+            'kwpos': parse_kwpos,}
+          # The parsed tables are a deterministic function of the csv
+          # files so we cache them in a pickle file alongside the csv's,
+          # keyed on the newest csv modification time.  On a cache hit a
+          # single pickle.load() replaces all the csv parsing and type
+          # conversion work below; the cache is transparently rebuilt
+          # whenever any of the csv files change.
+        cachefile = os.path.join (dir, CACHE_FILENAME)
+        cachekey = max (os.path.getmtime (os.path.join (dir, fn + '.csv'))
+                        for fn in parsers)
+        ct = read_cache (cachefile, cachekey)
+        if ct is not None: return ct
         ct = {}
-        for fn in coltypes.keys():
+        for fn in parsers.keys():
             filename = os.path.join (dir, fn + '.csv')
-            csvtbl = readcsv (filename, coltypes[fn], fn!='kwpos')
+            csvtbl = readcsv (filename, parsers[fn], fn!='kwpos')
             if fn == 'conjo':
                   # Handle conjo.csv specially: add each row to its dict under
                   # the key of a 5-tuple of the first five row values.  These
                   # (pos,conj,new,fml,onum) identify the okurigana and other
                   # data needed for a specific conjugation.
-                ct[fn] = dict (((tuple(row[0:5]),row) for row in csvtbl))
+                  # The okurigana and euphonic-change columns repeat a
+                  # small set of strings over many rows; intern them so
+                  # all rows share single string objects (pickle's memo
+                  # then also stores each just once in the cache file).
+                  # Blank euphr/euphk cells become None: downstream code
+                  # treats them as "no replacement" either way, and one
+                  # shared None beats a multitude of empty strings.
+                for row in csvtbl:
+                    row[6] = sys.intern (row[6])
+                    row[7] = sys.intern (row[7]) if row[7] else None
+                    row[8] = sys.intern (row[8]) if row[8] else None
+                ct[fn] = {tuple(row[0:5]): row for row in csvtbl}
+                  # Also store the conjugation data in struct-of-arrays
+                  # form: one parallel list per field that construct()
+                  # needs, indexed by a compact row id, plus a map from
+                  # conjugation key to row id.  Scans that want only a
+                  # few fields touch just those columns rather than
+                  # full ten-element rows; ct['conjo'] keeps the
+                  # row-per-key layout for existing users.  The row ids
+                  # follow sorted (pos,conj,neg,fml,onum) key order.
+                keys = sorted (ct[fn])
+                soa = ct['conjo_soa'] = {
+                    'rowid': {key: rid for rid,key in enumerate (keys)},
+                    'key':   keys,
+                    'stem':  [ct[fn][k][5] for k in keys],
+                    'okuri': [ct[fn][k][6] for k in keys],
+                    'euphr': [ct[fn][k][7] for k in keys],
+                    'euphk': [ct[fn][k][8] for k in keys],}
+                  # Index the rows by part-of-speech number: pos -> list
+                  # of row ids, in key order since the ids are assigned
+                  # from the sorted keys.
+                by_pos = collections.defaultdict (list)
+                for rid,key in enumerate (keys):
+                    by_pos[key[0]].append (rid)
+                ct['_by_pos'] = dict (by_pos)
+                  # From the SoA columns precompute per-pos "templates":
+                  # the conjugation key plus just the four fields that
+                  # construct() needs.  conjugate() applies these
+                  # directly without re-unpacking full ten-element rows
+                  # on every call.
+                ct['_templates'] = {
+                    pos: [(keys[rid], soa['stem'][rid], soa['okuri'][rid],
+                           soa['euphr'][rid], soa['euphk'][rid])
+                          for rid in rids]
+                    for pos,rids in ct['_by_pos'].items()}
             elif fn == 'conjo_notes':
                   # conjo_notes maps multiple conjugations (pos,conj,neg,fml,
                   #  onum) to multiple note numbers.  So instead of using a
                   #  dictionary keyed by conjugation and where each value is
                   #  a row, we use one where each value is a list of note
                   # numbers for that conjugation.
-                ct[fn] = d = collections.defaultdict (list)
+                d = collections.defaultdict (list)
                 for row in csvtbl: d[tuple(row[0:5])].append (row[5])
+                  # Freeze to a plain dict: readers look up many keys
+                  # that have no notes, and a defaultdict would insert
+                  # (and allocate) an empty list on every such miss.
+                ct[fn] = dict (d)
+                  # Pre-render the "[n,m,...]" note tag appended to the
+                  # conjugation text by combine_onums() so it is built
+                  # once per key here rather than on every call.
+                ct['_note_tags'] = {key: '[' + ','.join (map (str, v)) + ']'
+                                    for key,v in d.items()}
             else:
                   # For all other csv files, add the row to the dict with a key
                   # of the first column which is an id number.
-                ct[fn] = dict (((row[0],row) for row in csvtbl))
+                ct[fn] = {row[0]: row for row in csvtbl}
                   # Do the same to kwpos.csv but in addition add the same row
                   # with a key of the 2nd column (the kw abbr string.)  This 
                   # will allow us to look up kwpos records by either id number
                   # or keyword string.
-                if fn == 'kwpos': ct[fn].update (((row[1],row) 
-                                                  for row in csvtbl))
+                if fn == 'kwpos': ct[fn].update ({row[1]: row
+                                                  for row in csvtbl})
+        write_cache (cachefile, cachekey, ct)
+        return ct
+
+def read_cache (cachefile, cachekey):
+        '''Read the conjugation table dict from the pickle cache file
+        'cachefile' and return it, or return None if the file does not
+        exist, is unreadable, or was written by a different version of
+        this program or from csv files whose newest modification time
+        differs from 'cachekey' (i.e. the cache is stale).'''
+
+        try:
+            with open (cachefile, 'rb') as f:
+                version, key, ct = pickle.load (f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if version != CACHE_VERSION or key != cachekey: return None
         return ct
 
-def readcsv (filename, coltypes, hasheader):
-        ''' Read the csv file 'filename', using the function in 'coltypes'
-        to convert each datum to the correct datatype.  'coltypes' is indexed
-        by file, and then by column number.  If 'hasheader is true, then the
-        first line (containing column names) is skipped.  All the "conj*.csv
-        file have headers, the "kwpos.csv" file doesn't.
+def write_cache (cachefile, cachekey, ct):
+        '''Write the conjugation table dict 'ct' to the pickle cache file
+        'cachefile' along with 'cachekey' and the current cache version
+        number.  Failure to write (e.g. an unwritable data directory) is
+        ignored since the cache is only an optimization.'''
+
+        try:
+            with open (cachefile, 'wb') as f:
+                pickle.dump ((CACHE_VERSION, cachekey, ct), f,
+                             protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError: pass
+
+def readcsv (filename, parserow, hasheader):
+        ''' Read the csv file 'filename', using the function 'parserow' (one
+        of the parse_*() functions below) to convert each row's data to the
+        correct datatypes.  If 'hasheader is true, then the first line
+        (containing column names) is skipped.  All the "conj*.csv file
+        have headers, the "kwpos.csv" file doesn't.
         A list of rows, with each row a list of row items by column, is
-        returned.'''
+        returned.
+        If the pandas library is available the file is parsed with it in
+        bulk instead (see readcsv_pandas()); 'parserow' is unused in
+        that case but the returned data is the same.'''
 
-        table = []
+        if pandas is not None:
+            return readcsv_pandas (filename, hasheader)
         with open (filename, newline='') as f:
             reader = csv.reader(f, delimiter='\t')
             if hasheader: next (reader) # Skip header row.
-            for row in reader:
-                  # Apply a conversion function from 'coltypes'
-                  #  to convert each datum read from the file (as
-                  #  a string) to the right type (int, bool, etc).
-                newrow = [coltypes[cnum](col) for cnum, col in enumerate (row)]
-                table.append (newrow)
-            return table
-
-def sbool (arg):
-        'Convert a string to a bool.'
-        if arg.lower().startswith ('f'): return False
-        if arg.lower().startswith ('t'): return True
-        raise ValueError (arg)
-
-def xint (arg):
-        'Convert a string to an int or to None if blank.'
-        if arg is None or arg == '': return None
-        return int (arg)
+            return [parserow (row) for row in reader]
+
+  # Column datatype codes for each csv file, used by readcsv_pandas()
+  # to pick a whole-column conversion: 'i': int, 's': str, 'b': bool
+  # (from a "t..."/"f..." string), 'x': int, or None if blank.  These
+  # mirror the per-column conversions of the parse_*() functions below.
+COLSPECS = {
+    'conj': 'is',
+    'conjo': 'iibbiisssx',
+    'conotes': 'is',
+    'conjo_notes': 'iibbii',
+    'kwpos': 'iss',}
+
+def readcsv_pandas (filename, hasheader):
+        '''Read the csv file 'filename' with pandas.read_csv and convert
+        each column to its correct datatype (given by COLSPECS) in bulk
+        with vectorized pandas operations rather than cell by cell.
+        Returns the same list-of-rows structure as readcsv().'''
+
+        colspec = COLSPECS[os.path.splitext (os.path.basename (filename))[0]]
+          # Read every column as str; keep_default_na prevents blank
+          #  cells being turned into NaN so they stay as '' strings
+          #  like the csv module produces.
+        df = pandas.read_csv (filename, sep='\t', dtype=str,
+                              header=0 if hasheader else None,
+                              keep_default_na=False)
+        cols = []
+        for cnum, code in enumerate (colspec):
+            col = df.iloc[:, cnum]
+            if code == 'i':
+                cols.append (pandas.to_numeric (col).tolist())
+            elif code == 'b':
+                cols.append (col.str[0].map (SBOOL).tolist())
+            elif code == 'x':
+                cols.append ([None if pandas.isna (v) else int (v) for v in
+                              pandas.to_numeric (col, errors='coerce')])
+            else:
+                cols.append (col.tolist())
+        return [list (row) for row in zip (*cols)]
+
+# One row-conversion function per csv file.  Each converts a list of the
+# text strings read from the file into a list of values of the correct
+# datatypes with the conversions written out explicitly per column; this
+# avoids a per-cell dispatch through a table of conversion functions in
+# readcsv() which was the dominant cost of parsing the larger files.
+# Bool columns contain "t..." or "f..." strings and are converted by
+# looking the value's first character up in SBOOL: one dict access per
+# cell, with a KeyError on anything unrecognized.  The last (pos2)
+# column of conjo.csv may be blank and is converted to None in that case.
+
+SBOOL = {'t': True, 'T': True, 'f': False, 'F': False}
+
+def parse_conj (row):
+        return [int (row[0]), row[1]]
+
+def parse_conjo (row):
+        return [int (row[0]), int (row[1]),
+                SBOOL[row[2][0]], SBOOL[row[3][0]],
+                int (row[4]), int (row[5]), row[6], row[7], row[8],
+                int (row[9]) if row[9] else None]
+
+def parse_conotes (row):
+        return [int (row[0]), row[1]]
+
+def parse_conjo_notes (row):
+        return [int (row[0]), int (row[1]),
+                SBOOL[row[2][0]], SBOOL[row[3][0]],
+                int (row[4]), int (row[5])]
+
+def parse_kwpos (row):
+        return [int (row[0]), row[1], row[2]]
 
 
 from argparse import ArgumentParser
 
+  # Regexes used by parse_args(), compiled once at module load rather
+  # than on each call.
+POS_RE = re.compile (r'[a-z0-9-]+$')
+WS_RE = re.compile (r'\s+')
+
 def parse_word (args):
         ''''args' is a list of one or two strings that are the kanji, kana
         arguments from the command line.  If two, we take them to be in the
@@ -335,7 +671,7 @@ def parse_args (argv=None):
 
         args = p.parse_args (argv)
         if args.list: return args
-        if not args.pos or not re.match(r'[a-z0-9-]+$', args.pos):
+        if not args.pos or not POS_RE.match (args.pos):
             p.error ("Argument 'pos' is required if --list not given.")
           # The shell won't distinguish args separated by jp space characters
           # as seperate.  But users will frequently enter jp space characters
@@ -343,7 +679,7 @@ def parse_args (argv=None):
           # to ascii for one character.  So we split them here.
         words = []
         for w in args.word:
-            ws = re.split (r'\s+', w)
+            ws = WS_RE.split (w)
             words.extend (ws)
         args.word = words
         if not 1 <= len (args.word) <= 2: